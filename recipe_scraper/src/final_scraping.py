@@ -1,35 +1,36 @@
-import requests
-from bs4 import BeautifulSoup
 import csv
-import json
 import re
 import time
 import os
 import sys
-import subprocess
-from urllib.parse import quote
 
-# Attempt to install required packages
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from bs4 import BeautifulSoup
-except ImportError:
-    print("Installing required packages...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests", "beautifulsoup4"])
-    import requests
-    from bs4 import BeautifulSoup
+    import soupsieve
+    import orjson
+except ImportError as e:
+    print(f"⚠️ Missing package '{e.name}'. Install dependencies with: pip install -r requirements.txt")
+    sys.exit(1)
+
+MAX_SEARCH_RESULTS = 20  # Result links collected per site; selection stops once this many match
+MAX_BACKOFF = 120  # Longest Retry-After wait honoured, in seconds
 
 # Configuration with robust fallback selectors
 SITE_CONFIG = {
     "BBC Good Food": {
-        "search_url": "https://www.bbcgoodfood.com/search?q={}",
+        "host": "https://www.bbcgoodfood.com",
+        "search_base_url": "https://www.bbcgoodfood.com/search",
         "recipe_selector": "a.standard-card-new__article-title, a.heading-4, div.card__content a",
         "time_selector": ".icon-time, .cook-and-prep-time, .time",
         "ingredients_selector": ".recipe__ingredients li, .ingredients-list__item, .ingredient",
         "instructions_selector": ".recipe__method-steps li, .method__item, .instruction"
     },
     "AllRecipes": {
-        "search_url": "https://www.allrecipes.com/search?q={}",
+        "host": "https://www.allrecipes.com",
+        "search_base_url": "https://www.allrecipes.com/search",
         "recipe_selector": "a.card__titleLink, a.recipeCard__titleLink",
         "time_selector": ".recipe-meta-item-body, .m-recipe-meta__item",
         "ingredients_selector": ".ingredients-item-name, .m-ingredient__name",
@@ -37,6 +38,16 @@ SITE_CONFIG = {
     }
 }
 
+def compile_selectors(selector_group):
+    """Split a comma-separated fallback group and compile each selector once"""
+    return tuple(soupsieve.compile(selector.strip()) for selector in selector_group.split(', '))
+
+# Pre-compiled fallback selectors per site, so pages don't re-parse the same CSS every time
+SELECTORS = {
+    site_name: {key: compile_selectors(value) for key, value in config.items() if key.endswith('_selector')}
+    for site_name, config in SITE_CONFIG.items()
+}
+
 def get_headers():
     """Generate headers for requests"""
     return {
@@ -47,28 +58,48 @@ def get_headers():
         'Referer': 'https://www.google.com/'
     }
 
-def get_recipe_details(url, site_name):
+class CappedRetry(Retry):
+    """Retry that honours Retry-After but never sleeps longer than MAX_BACKOFF"""
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_BACKOFF)
+
+def create_session():
+    """Create a pooled session so both sites reuse keep-alive connections"""
+    session = requests.Session()
+    session.headers.update(get_headers())
+    # Retry rate-limited/transient failures with exponential backoff, honouring Retry-After up to MAX_BACKOFF
+    retry = CappedRetry(total=5, backoff_factor=1.0, status_forcelist=[429, 500, 502, 503, 504],
+                  respect_retry_after_header=True, allowed_methods=['GET'], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_recipe_details(url, site_name, session):
     """Extract recipe details with comprehensive error handling"""
     print(f"🔍 Extracting recipe from {url}")
     try:
-        headers = get_headers()
-        response = requests.get(url, headers=headers, timeout=20)
+        response = session.get(url, timeout=20)
         
         if response.status_code != 200:
             print(f"⚠️ HTTP Error {response.status_code} for {url}")
+            if 'Retry-After' in response.headers:
+                print(f"⏳ Server asked to retry after {response.headers['Retry-After']}")
             return None
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Extract recipe name
-        name = soup.find('h1').get_text(strip=True) if soup.find('h1') else "Untitled Recipe"
+        h1 = soup.find('h1')
+        name = h1.get_text(strip=True) if h1 else "Untitled Recipe"
         print(f"✅ Found recipe: {name}")
         
         # Extract cooking time
-        time_config = SITE_CONFIG[site_name]
+        selectors = SELECTORS[site_name]
         time_element = None
-        for selector in time_config["time_selector"].split(', '):
-            time_element = soup.select_one(selector.strip())
+        for selector in selectors["time_selector"]:
+            time_element = selector.select_one(soup)
             if time_element:
                 break
         cooking_time = time_element.get_text(strip=True) if time_element else "Not specified"
@@ -76,8 +107,8 @@ def get_recipe_details(url, site_name):
         
         # Extract ingredients
         ingredients = []
-        for selector in time_config["ingredients_selector"].split(', '):
-            ingredients_elements = soup.select(selector.strip())
+        for selector in selectors["ingredients_selector"]:
+            ingredients_elements = selector.select(soup)
             if ingredients_elements:
                 for item in ingredients_elements:
                     ingredient = item.get_text(strip=True)
@@ -89,8 +120,8 @@ def get_recipe_details(url, site_name):
         
         # Extract instructions
         instructions = []
-        for selector in time_config["instructions_selector"].split(', '):
-            instructions_elements = soup.select(selector.strip())
+        for selector in selectors["instructions_selector"]:
+            instructions_elements = selector.select(soup)
             if instructions_elements:
                 for i, step in enumerate(instructions_elements, 1):
                     instruction = step.get_text(strip=True)
@@ -117,40 +148,37 @@ def get_recipe_details(url, site_name):
         print("⚠️ Saved HTML to recipe_error.html for inspection")
         return None
 
-def search_recipes(recipe_name):
+def search_recipes(recipe_name, session):
     """Search for recipes across configured sites"""
     all_recipes = []
-    query = quote(recipe_name)
+    # Same query for every site; requests URL-encodes it
+    params = {'q': recipe_name}
     
     for site_name, config in SITE_CONFIG.items():
         print(f"\n🌐 Searching {site_name} for '{recipe_name}'...")
         try:
-            search_url = config["search_url"].format(query)
-            print(f"🔗 Search URL: {search_url}")
-            
-            headers = get_headers()
-            response = requests.get(search_url, headers=headers, timeout=20)
+            response = session.get(config["search_base_url"], params=params, timeout=20)
+            print(f"🔗 Search URL: {response.url}")
             
             if response.status_code != 200:
                 print(f"⚠️ HTTP Error {response.status_code} on {site_name}")
+                if 'Retry-After' in response.headers:
+                    print(f"⏳ Server asked to retry after {response.headers['Retry-After']}")
                 continue
                 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             recipe_links = []
             
             # Find recipe links using multiple selectors
-            for selector in config["recipe_selector"].split(', '):
-                links = soup.select(selector.strip())
+            for selector in SELECTORS[site_name]["recipe_selector"]:
+                links = selector.select(soup, limit=MAX_SEARCH_RESULTS)
                 if links:
                     for link in links:
                         href = link.get('href', '')
                         if href:
                             # Convert relative URLs to absolute
                             if not href.startswith('http'):
-                                if 'bbcgoodfood' in search_url:
-                                    href = f"https://www.bbcgoodfood.com{href}"
-                                elif 'allrecipes' in search_url:
-                                    href = f"https://www.allrecipes.com{href}"
+                                href = f"{config['host']}{href}"
                             recipe_links.append(href)
                     if recipe_links:
                         break
@@ -158,7 +186,7 @@ def search_recipes(recipe_name):
             if recipe_links:
                 print(f"🔗 Found {len(recipe_links)} recipe links")
                 # Get details for the first recipe found
-                recipe = get_recipe_details(recipe_links[0], site_name)
+                recipe = get_recipe_details(recipe_links[0], site_name, session)
                 if recipe:
                     all_recipes.append(recipe)
                     print(f"✅ Successfully scraped recipe from {site_name}")
@@ -198,8 +226,8 @@ def save_to_csv(recipes, filename):
 def save_to_json(recipes, filename):
     """Save recipes to a JSON file"""
     try:
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(recipes, file, indent=2)
+        with open(filename, 'wb') as file:
+            file.write(orjson.dumps(recipes, option=orjson.OPT_INDENT_2))
         return True
     except Exception as e:
         print(f"⚠️ Error saving JSON: {str(e)}")
@@ -219,8 +247,9 @@ def main():
     
     print(f"\n🔍 Searching for '{recipe_name}'...")
     
+    session = create_session()
     try:
-        recipes = search_recipes(recipe_name)
+        recipes = search_recipes(recipe_name, session)
         
         if not recipes:
             print("\n❌ No recipes found. Possible reasons:")
@@ -260,6 +289,8 @@ def main():
     except Exception as e:
         print(f"\n❌ CRITICAL ERROR: {str(e)}")
         print("Please report this issue with the error message")
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
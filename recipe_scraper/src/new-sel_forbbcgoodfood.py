@@ -1,30 +1,38 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from playwright.sync_api import sync_playwright
 import time
 import re
 import json
 
-def get_recipe_links_bbc(query):
-    """Get recipe links from BBC Good Food using direct HTML parsing"""
-    headers = {
+# Headless browser kept warm across searches; started on first fallback
+BLOCKED_RESOURCES = ('image', 'stylesheet', 'font', 'media')
+_playwright = None
+_browser = None
+
+def create_session():
+    """Create a pooled session so search and recipe pages share one keep-alive connection"""
+    session = requests.Session()
+    session.headers.update({
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-    }
-    
+    })
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def get_recipe_links_bbc(query, session):
+    """Get recipe links from BBC Good Food using direct HTML parsing"""
     # First try to find recipes through search
     search_url = f"https://www.bbcgoodfood.com/search?q={query.replace(' ', '%20')}"
     try:
-        response = requests.get(search_url, headers=headers, timeout=10)
+        response = session.get(search_url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         recipe_links = []
         
         # Try multiple selector patterns
@@ -68,20 +76,17 @@ def get_recipe_links_bbc(query):
         print(f"⚠️ Request failed: {str(e)}")
         return []
 
-def get_recipe_details(url):
+def get_recipe_details(url, session):
     """Get detailed recipe information from a BBC Good Food recipe page"""
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36',
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = session.get(url, timeout=10)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        soup = BeautifulSoup(response.content, 'lxml')
         
         # Extract recipe name
-        name = soup.find('h1').get_text(strip=True) if soup.find('h1') else "Untitled Recipe"
+        h1 = soup.find('h1')
+        name = h1.get_text(strip=True) if h1 else "Untitled Recipe"
         
         # Extract cooking time
         time_element = soup.select_one('.icon-time')
@@ -161,38 +166,52 @@ def get_recipe_details(url):
         print(f"⚠️ Failed to get recipe details: {str(e)}")
         return None
 
-def get_recipe_links_selenium(query):
-    """Fallback method using Selenium when direct requests fail"""
-    chrome_options = Options()
-    chrome_options.add_argument("--headless=new")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
-    
+def get_browser():
+    """Launch headless Chromium once and reuse it for every later search"""
+    global _playwright, _browser
+    if _browser is None:
+        _playwright = sync_playwright().start()
+        _browser = _playwright.chromium.launch(headless=True)
+    return _browser
+
+def close_browser():
+    """Shut down the shared browser if it was started"""
+    global _playwright, _browser
+    if _browser is not None:
+        _browser.close()
+        _playwright.stop()
+        _playwright = _browser = None
+
+def block_heavy_resources(route):
+    """Abort images, CSS, fonts and media - only the result links are needed"""
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        route.abort()
+    else:
+        route.continue_()
+
+def get_recipe_links_browser(query):
+    """Fallback method using a headless browser when direct requests fail"""
     try:
-        service = Service(executable_path='chromedriver.exe')
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        driver.get(f"https://www.bbcgoodfood.com/search?q={query.replace(' ', '%20')}")
-        
-        # Wait for recipes to load
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "a.standard-card-new__article-title"))
-        )
-        
-        # Get all recipe links
-        recipe_links = []
-        links = driver.find_elements(By.CSS_SELECTOR, "a.standard-card-new__article-title")
-        for link in links:
-            href = link.get_attribute('href')
-            if href and '/recipes/' in href:
-                recipe_links.append(href)
+        context = get_browser().new_context(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36")
+        try:
+            context.route("**/*", block_heavy_resources)
+            page = context.new_page()
+            page.goto(f"https://www.bbcgoodfood.com/search?q={query.replace(' ', '%20')}")
+            
+            # Wait for recipes to load
+            page.wait_for_selector("a.standard-card-new__article-title", timeout=15000)
+            
+            # Get all recipe links
+            links = page.eval_on_selector_all("a.standard-card-new__article-title", "els => els.map(e => e.href)")
+        finally:
+            # Only the context is thrown away; the browser stays warm for the next query
+            context.close()
         
-        driver.quit()
+        recipe_links = [href for href in links if href and '/recipes/' in href]
         return list(set(recipe_links))
     
     except Exception as e:
-        print(f"⚠️ Selenium failed: {str(e)}")
+        print(f"⚠️ Browser automation failed: {str(e)}")
         return []
 
 def display_recipe(recipe):
@@ -232,35 +251,40 @@ def main():
     
     print(f"\n🚀 Searching BBC Good Food for '{query}'...")
     
-    # First try direct method
-    recipe_links = get_recipe_links_bbc(query)
+    session = create_session()
+    try:
+        # First try direct method
+        recipe_links = get_recipe_links_bbc(query, session)
     
-    # If no results, try Selenium fallback
-    if not recipe_links:
-        print("ℹ️ Direct search failed, trying with browser automation...")
-        recipe_links = get_recipe_links_selenium(query)
+        # If no results, try headless browser fallback
+        if not recipe_links:
+            print("ℹ️ Direct search failed, trying with browser automation...")
+            recipe_links = get_recipe_links_browser(query)
     
-    if not recipe_links:
-        print("\n❌ No recipes found. Please try a different search term.")
-        return
+        if not recipe_links:
+            print("\n❌ No recipes found. Please try a different search term.")
+            return
     
-    print(f"\n✅ Found {len(recipe_links)} recipes. Getting details for the first one...")
+        print(f"\n✅ Found {len(recipe_links)} recipes. Getting details for the first one...")
     
-    # Get details for the first recipe
-    recipe = get_recipe_details(recipe_links[0])
+        # Get details for the first recipe
+        recipe = get_recipe_details(recipe_links[0], session)
     
-    if recipe:
-        display_recipe(recipe)
+        if recipe:
+            display_recipe(recipe)
         
-        # Offer to show more recipes
-        if len(recipe_links) > 1:
-            show_more = input(f"Show next recipe? ({len(recipe_links)-1} more available) (y/n): ").lower()
-            if show_more == 'y':
-                recipe = get_recipe_details(recipe_links[1])
-                if recipe:
-                    display_recipe(recipe)
-    else:
-        print("❌ Failed to retrieve recipe details")
+            # Offer to show more recipes
+            if len(recipe_links) > 1:
+                show_more = input(f"Show next recipe? ({len(recipe_links)-1} more available) (y/n): ").lower()
+                if show_more == 'y':
+                    recipe = get_recipe_details(recipe_links[1], session)
+                    if recipe:
+                        display_recipe(recipe)
+        else:
+            print("❌ Failed to retrieve recipe details")
+    finally:
+        session.close()
+        close_browser()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
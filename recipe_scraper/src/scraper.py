@@ -1,11 +1,19 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import aiohttp
+from lxml import etree
 import json
+import orjson
 import csv
 import time
 import os
+import re
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 import logging
 
 # ========== SETUP ========== #
@@ -37,63 +45,158 @@ RECIPE_WEBSITES = [
 RATE_LIMIT = 1.5
 MAX_RECIPES_PER_SITE = 10  # Scrape up to 10 per site
 MAX_TOTAL_RECIPES = 500    # Stop after collecting 500 total
+MAX_CONCURRENCY = 10       # Open connections across all sites
+MAX_WORKERS = min(8, len(RECIPE_WEBSITES))  # Sites parsed in parallel processes
+MAX_RETRIES = 5            # Retries on 429/5xx before giving up on a page
+BACKOFF_FACTOR = 1.0       # Waits 1s, 2s, 4s... between retries
+MAX_BACKOFF = 120
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CHUNK_SIZE = 16384         # Bytes handed to the HTML parser per network read
+HREF_RE = re.compile(r'(?i)recipe')  # Keywords marking a link as a recipe page
 DATA_DIR = "data"
+JSONL_PATH = os.path.join(DATA_DIR, 'recipes.jsonl')  # Written as recipes arrive; also the resume checkpoint
 
 # ========== LOGGING ========== #
 os.makedirs(DATA_DIR, exist_ok=True)
 logging.basicConfig(level=logging.INFO)
 domain_timers = {}
+# One lock per domain keeps requests to a site RATE_LIMIT apart while other sites proceed
+DOMAIN_LOCKS = defaultdict(asyncio.Lock)
+ROBOTS = {}  # domain -> RobotFileParser, or None when robots.txt couldn't be read
 
 # ========== HELPERS ========== #
-def make_request(url):
+def normalize_url(url):
+    """Drop query, fragment and trailing slash so tracking variants of a page collapse together"""
+    return urlparse(url)._replace(query='', fragment='').geturl().rstrip('/')
+
+def retry_delay(retry_after, attempt):
+    """Seconds to wait before the next attempt, honouring Retry-After when the server sends it"""
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = BACKOFF_FACTOR * (2 ** attempt)
+    else:
+        delay = BACKOFF_FACTOR * (2 ** attempt)
+    return min(max(0, delay), MAX_BACKOFF)
+
+async def allowed(session, url):
+    """Check url against the domain's robots.txt, fetching and caching it on first use"""
+    parsed = urlparse(url)
+    domain = parsed.netloc
+    if domain not in ROBOTS:
+        rp = None
+        try:
+            async with session.get(f"{parsed.scheme}://{domain}/robots.txt",
+                                   timeout=aiohttp.ClientTimeout(total=10)) as res:
+                domain_timers[domain] = time.time()
+                rp = RobotFileParser()
+                # Same status handling as RobotFileParser.read()
+                if res.status in (401, 403):
+                    rp.disallow_all = True
+                elif res.status >= 400:
+                    rp.allow_all = True
+                else:
+                    rp.parse((await res.text(errors='ignore')).splitlines())
+        except Exception as e:
+            logging.debug(f"Could not read robots.txt for {domain}: {e}")
+            rp = None
+        ROBOTS[domain] = rp
+    rp = ROBOTS[domain]
+    return rp is None or rp.can_fetch(HEADERS['User-Agent'], url)
+
+async def fetch(session, url, consume=None):
+    """GET url politely; consume(res) is awaited on the open response, otherwise the body is read whole"""
     domain = urlparse(url).netloc
-    now = time.time()
-    if domain in domain_timers and now - domain_timers[domain] < RATE_LIMIT:
-        time.sleep(RATE_LIMIT - (now - domain_timers[domain]))
+    async with DOMAIN_LOCKS[domain]:
+        # Skip disallowed pages before paying for the round-trip
+        if not await allowed(session, url):
+            logging.info(f"Skipping {url}: disallowed by robots.txt")
+            return None
+        for attempt in range(MAX_RETRIES + 1):
+            if domain in domain_timers:
+                await asyncio.sleep(max(0, RATE_LIMIT - (time.time() - domain_timers[domain])))
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as res:
+                    domain_timers[domain] = time.time()
+                    if res.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        res.raise_for_status()
+                        if consume is None:
+                            return await res.read()
+                        return await consume(res)
+                    retry_after = res.headers.get('Retry-After')
+                    delay = retry_delay(retry_after, attempt)
+                    logging.warning(f"HTTP {res.status} for {url} (Retry-After: {retry_after}), "
+                                    f"retrying in {delay:.1f}s")
+            except Exception as e:
+                logging.warning(f"Request failed for {url}: {e}")
+                return None
+            # Back off outside the response so its connection returns to the pool;
+            # still holding the domain lock, so the whole site backs off
+            await asyncio.sleep(delay)
+
+async def stream_elements(res, tag, handle):
+    """Parse the body as it arrives, stopping (and skipping the rest) once handle(elem) returns a result"""
+    parser = etree.HTMLPullParser(events=('end',), tag=tag, encoding=res.charset or 'utf-8')
+
+    def drain():
+        for _, elem in parser.read_events():
+            result = handle(elem)
+            if result is not None:
+                return result
+        return None
+
+    async for chunk in res.content.iter_chunked(CHUNK_SIZE):
+        parser.feed(chunk)
+        result = drain()
+        if result is not None:
+            return result
     try:
-        res = requests.get(url, headers=HEADERS, timeout=10)
-        domain_timers[domain] = time.time()
-        res.raise_for_status()
-        return res
-    except Exception as e:
-        logging.warning(f"Request failed for {url}: {e}")
+        parser.close()
+    except etree.XMLSyntaxError:
         return None
+    return drain()
 
-def get_links(site_url, max_links):
-    res = make_request(site_url)
-    if not res: return []
-    soup = BeautifulSoup(res.text, 'html.parser')
+def recipe_ld(script):
+    """Return the Recipe object from a JSON-LD <script>, or None"""
+    if script.get('type') != 'application/ld+json' or not script.text:
+        return None
+    try:
+        data = json.loads(script.text)
+        if isinstance(data, list):
+            data = next((i for i in data if i.get('@type') == 'Recipe'), {})
+        return data if data.get('@type') == 'Recipe' else None
+    except Exception:
+        return None
+
+async def get_links(session, site_url, max_links):
     links = set()
     domain = urlparse(site_url).netloc
-    for a in soup.find_all('a', href=True):
-        href = a['href']
+
+    def collect(a):
+        href = a.get('href')
+        if not href: return None
         if href.startswith('/'):
             href = f"https://{domain}{href}"
-        if any(word in href.lower() for word in ['recipe']) and domain in href:
+        if domain in href and HREF_RE.search(href):
             links.add(href)
-        if len(links) >= max_links:
-            break
+        return links if len(links) >= max_links else None
+
+    await fetch(session, site_url, lambda res: stream_elements(res, 'a', collect))
     return list(links)
 
-def parse_recipe(url):
-    res = make_request(url)
-    if not res: return None
-    soup = BeautifulSoup(res.text, 'html.parser')
-    recipe = {"source_url": url, "name": "", "ingredients": [], "instructions": []}
-    try:
-        script = soup.find('script', type='application/ld+json')
-        if script:
-            data = json.loads(script.string.strip())
-            if isinstance(data, list):
-                data = next((i for i in data if i.get('@type') == 'Recipe'), {})
-            if data.get('@type') == 'Recipe':
-                recipe['name'] = data.get('name', '')
-                recipe['ingredients'] = data.get('recipeIngredient', [])
-                steps = data.get('recipeInstructions', [])
-                if isinstance(steps, list):
-                    recipe['instructions'] = [s.get('text', '') if isinstance(s, dict) else s for s in steps]
-    except Exception:
-        pass
+async def parse_recipe(session, url):
+    # Stops reading the page as soon as the Recipe JSON-LD block has been parsed
+    data = await fetch(session, url, lambda res: stream_elements(res, 'script', recipe_ld))
+    if not data: return None
+    recipe = {"source_url": url, "name": data.get('name', ''),
+              "ingredients": data.get('recipeIngredient', []), "instructions": []}
+    steps = data.get('recipeInstructions', [])
+    if isinstance(steps, list):
+        recipe['instructions'] = [s.get('text', '') if isinstance(s, dict) else s for s in steps]
     return recipe if recipe['ingredients'] or recipe['instructions'] else None
 
 # ========== SAVE FUNCTIONS ========== #
@@ -101,43 +204,94 @@ def save_csv(data, path):
     with open(path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=["source_url", "name", "ingredients", "instructions"])
         writer.writeheader()
-        for r in data:
-            writer.writerow({
-                "source_url": r['source_url'],
-                "name": r['name'],
-                "ingredients": " | ".join(r['ingredients']),
-                "instructions": " | ".join(r['instructions'])
-            })
+        writer.writerows([{
+            "source_url": r['source_url'],
+            "name": r['name'],
+            "ingredients": " | ".join(r['ingredients']),
+            "instructions": " | ".join(r['instructions'])
+        } for r in data])
 
 def save_json(data, path):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
-def save_jsonl(data, path):
-    with open(path, 'w', encoding='utf-8') as f:
-        for item in data:
-            f.write(json.dumps(item) + '\n')
+def load_jsonl(path):
+    """Yield saved recipes, skipping a line left half-written by a crash"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
 
 # ========== MAIN SCRAPER ========== #
+async def get_site_links(session, site):
+    try:
+        return await get_links(session, site, MAX_RECIPES_PER_SITE)
+    except Exception as e:
+        logging.error(f"Failed on site {site}: {e}")
+        return []
+
+async def collect_links(skip=()):
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=1)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        link_lists = await tqdm_asyncio.gather(
+            *[get_site_links(session, site) for site in RECIPE_WEBSITES], desc="Finding Links")
+    # Sites cross-link each other, so drop repeats before paying for a fetch
+    seen = {normalize_url(site) for site in RECIPE_WEBSITES} | set(skip)
+    site_links = []
+    for links in link_lists:
+        unique = []
+        for link in links:
+            key = normalize_url(link)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(link)
+        if unique:
+            site_links.append(unique)
+    return site_links
+
+async def parse_recipes(links):
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=1)
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+        recipes = await asyncio.gather(*[parse_recipe(session, link) for link in links])
+    return [r for r in recipes if r]
+
+def scrape_site(links):
+    """Process-pool entry point: fetch and parse one site's recipe pages on this worker's own event loop"""
+    DOMAIN_LOCKS.clear()  # Locks inherited from the parent belong to its event loop
+    return asyncio.run(parse_recipes(links))
+
 def main():
-    all_recipes = []
-    for site in tqdm(RECIPE_WEBSITES, desc="Scraping Sites"):
-        try:
-            links = get_links(site, MAX_RECIPES_PER_SITE)
-            for link in links:
-                recipe = parse_recipe(link)
-                if recipe:
-                    all_recipes.append(recipe)
-                if len(all_recipes) >= MAX_TOTAL_RECIPES:
+    # Resume from an earlier run: anything already in the JSONL file is not fetched again
+    done = {normalize_url(r['source_url']) for r in load_jsonl(JSONL_PATH)}
+    total = len(done)
+    if done:
+        logging.info(f"Resuming with {total} recipes already saved.")
+
+    if total < MAX_TOTAL_RECIPES:
+        site_links = asyncio.run(collect_links(done))
+        # Each site gets its own process, so parsing runs on several cores while domains stay rate limited
+        with open(JSONL_PATH, 'ab') as jsonl_f, ProcessPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            futures = [ex.submit(scrape_site, links) for links in site_links]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Scraping Sites"):
+                for recipe in future.result()[:MAX_TOTAL_RECIPES - total]:
+                    jsonl_f.write(orjson.dumps(recipe) + b'\n')
+                    total += 1
+                jsonl_f.flush()
+                if total >= MAX_TOTAL_RECIPES:
+                    # Drop sites that haven't started; shutdown(cancel_futures=True) needs Python 3.9+
+                    for f in futures:
+                        f.cancel()
                     break
-        except Exception as e:
-            logging.error(f"Failed on site {site}: {e}")
-        if len(all_recipes) >= MAX_TOTAL_RECIPES:
-            break
 
+    # The JSONL file is canonical; the CSV and pretty JSON are rebuilt from it
+    all_recipes = list(load_jsonl(JSONL_PATH))
     save_csv(all_recipes, os.path.join(DATA_DIR, 'recipes.csv'))
     save_json(all_recipes, os.path.join(DATA_DIR, 'recipes.json'))
-    save_jsonl(all_recipes, os.path.join(DATA_DIR, 'recipes.json1'))
     logging.info(f"Saved {len(all_recipes)} recipes.")
 
 if __name__ == '__main__':
@@ -1,13 +1,20 @@
-import requests
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
 from bs4 import BeautifulSoup
-import json
+import soupsieve
+import orjson
 import csv
+import shelve
+import os
 import time
 import random
 from urllib.parse import urlparse
 import re
 import logging
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -43,38 +50,132 @@ RECIPE_WEBSITES = [
     "https://www.minimalistbaker.com/recipes/"
 ]
 
-# Track last request time per domain
-domain_timers = {}
+MAX_RECIPES = 100
+RATE_LIMIT = 1.5  # Seconds between requests to the same domain
+FLUSH_EVERY = 25  # CSV rows written between flushes
+MAX_WORKERS = os.cpu_count() or 1  # Processes for HTML parsing
 
-def make_request(url):
-    """Make polite requests with rate limiting per domain"""
-    domain = urlparse(url).netloc
-    current_time = time.time()
+# Link-scan signals: classes of recipe card containers, and keywords in a link's URL or text
+CARD_CLASSES = ['card', 'recipe-card', 'post-card', 'item', 'teaser', 'summary', 'content-card', 'result']
+RECIPE_URL_RE = re.compile(r'recipe|dish|cook|make', re.I)
+RECIPE_TEXT_RE = re.compile(r'recipe|cook|make', re.I)
+
+# Fallback containers for pages without usable JSON-LD, compiled once instead of per page
+INGREDIENT_SELECTORS = tuple(soupsieve.compile(selector) for selector in (
+    '.ingredients', '.recipe-ingredients', '.ingredient',
+    '.ingredients-list', '.recipe-ingred_txt', '.wprm-recipe-ingredient',
+    '.ingredients-section', '[class*="ingredient"]'
+))
+INSTRUCTION_SELECTORS = tuple(soupsieve.compile(selector) for selector in (
+    '.instructions', '.recipe-steps', '.directions',
+    '.recipe-instructions', '.wprm-recipe-instruction',
+    '.instructions-section', '[class*="instruction"]',
+    '[class*="direction"]', '[class*="step"]'
+))
+
+# Retry transient failures a few times before giving up on a page
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_CONCURRENCY = 16  # Requests in flight across all sites
+
+# On-disk cache of landing pages (with their ETag/Last-Modified) and parsed recipes, reused across runs
+DATA_DIR = "data"
+CACHE_PATH = os.path.join(DATA_DIR, 'url_cache')
+CACHE_MAX_AGE = 7 * 24 * 3600  # Entries older than a week are dropped and re-scraped
+
+# Next time each host may be hit
+host_locks = defaultdict(asyncio.Lock)
+host_next_ok = {}
+# Cap in-flight requests per domain
+host_semaphores = defaultdict(lambda: asyncio.Semaphore(2))
+seen_urls = set()  # Recipe URLs already claimed by a site this run
+
+async def wait_for_slot(domain, backoff=0):
+    """Wait for this host's next slot, and at least `backoff` seconds"""
+    loop = asyncio.get_running_loop()
+    async with host_locks[domain]:
+        wait = max(host_next_ok.get(domain, 0) - loop.time(), backoff)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        host_next_ok[domain] = loop.time() + RATE_LIMIT
+
+@lru_cache(maxsize=4096)
+def parse_url(url):
+    """urlparse, memoised: landing pages are parsed by both get_recipe_links and make_request"""
+    return urlparse(url)
+
+def prune_cache(cache):
+    """Drop entries older than CACHE_MAX_AGE so the cache doesn't grow without bound"""
+    cutoff = time.time() - CACHE_MAX_AGE
+    for key in [key for key, entry in cache.items() if entry.get('stored_at', 0) < cutoff]:
+        del cache[key]
+
+async def make_request(session, url, cache=None):
+    """Make polite requests with rate limiting per domain, returning the raw page bytes"""
+    domain = parse_url(url).netloc
     
-    # Respect domain-specific delay
-    if domain in domain_timers:
-        elapsed = current_time - domain_timers[domain]
-        if elapsed < 1.5:  # 1.5 second delay per domain
-            time.sleep(1.5 - elapsed)
+    # Revalidate a cached copy instead of downloading it again
+    cached = cache.get(f"page:{url}") if cache is not None else None
+    headers = {}
+    if cached:
+        if cached['etag']:
+            headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            headers['If-Modified-Since'] = cached['last_modified']
     
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        domain_timers[domain] = time.time()
-        response.raise_for_status()  # Raise exception for 4xx/5xx responses
-        return response
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed for {url}: {str(e)}")
-        return None
+    async with host_semaphores[domain]:
+        backoff = 0
+        for attempt in range(MAX_RETRIES + 1):
+            # Rate limiting, retries included
+            await wait_for_slot(domain, backoff)
+            try:
+                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                    if response.status == 304 and cached:
+                        return cached['content']
+                    if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        response.raise_for_status()  # Raise exception for 4xx/5xx responses
+                        content = await response.read()
+                        if cache is not None:
+                            cache[f"page:{url}"] = {
+                                'stored_at': time.time(),
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                                'content': content
+                            }
+                        return content
+                # Exponential backoff with jitter
+                backoff = BACKOFF_FACTOR * (2 ** attempt) + random.random()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Request failed for {url}: {str(e)}")
+                return None
 
-def extract_recipe_data(url):
-    """Extract recipe details from a URL with robust fallbacks"""
-    logger.info(f"Extracting recipe from: {url}")
-    response = make_request(url)
-    if not response or response.status_code != 200:
-        logger.warning(f"Failed to retrieve content from {url}")
-        return None
+def _find_recipe(node, types=('Recipe',)):
+    """Return the first recipe object in parsed JSON-LD, searching lists and @graph wrappers recursively"""
+    if isinstance(node, list):
+        for item in node:
+            found = _find_recipe(item, types)
+            if found is not None:
+                return found
+    elif isinstance(node, dict):
+        node_type = node.get('@type')
+        if node_type in types or (isinstance(node_type, list) and any(t in types for t in node_type)):
+            return node
+        if '@graph' in node:
+            return _find_recipe(node['@graph'], types)
+    return None
+
+def _clean_recipe(recipe_data):
+    """Flatten stray newlines and fill in a placeholder name"""
+    recipe_data['name'] = recipe_data['name'].replace('\n', ' ').strip() or 'Unknown Recipe Name'
+    recipe_data['ingredients'] = [ing.replace('\n', ' ').strip() for ing in recipe_data['ingredients']]
+    recipe_data['instructions'] = [step.replace('\n', ' ').strip() for step in recipe_data['instructions']]
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    return recipe_data
+
+def parse_recipe_page(content, url):
+    """Parse a downloaded recipe page into a recipe dict; runs in a worker process"""
+    soup = BeautifulSoup(content, 'lxml')
     recipe_data = {
         "name": "",
         "ingredients": [],
@@ -82,24 +183,47 @@ def extract_recipe_data(url):
         "source_url": url
     }
     
-    # ====== NAME EXTRACTION ======
-    # Try schema.org structured data
+    # ====== STRUCTURED DATA ======
+    # Parse the schema.org JSON-LD once and reuse it for every field below
+    recipe = None
     script = soup.find('script', type='application/ld+json')
-    if script:
+    if script and script.string:
         try:
-            data = json.loads(script.string)
-            if isinstance(data, list):
-                for item in data:
-                    if item.get('@type') == 'Recipe' and item.get('name'):
-                        recipe_data['name'] = item['name']
-                        break
-                else:
-                    data = data[0] if data else {}
-            elif isinstance(data, dict) and data.get('@type') == 'Recipe':
-                recipe_data['name'] = data.get('name', '')
-        except (json.JSONDecodeError, TypeError) as e:
+            # orjson rejects str subclasses such as NavigableString, so hand it bytes
+            recipe = _find_recipe(orjson.loads(script.string.encode()))
+        except (orjson.JSONDecodeError, TypeError) as e:
             logger.debug(f"JSON decode error in {url}: {str(e)}")
+    recipe = recipe or {}
+    
+    # ====== NAME EXTRACTION ======
+    # Try schema.org structured data
+    recipe_data['name'] = recipe.get('name') or ''
+    
+    # ====== INGREDIENTS EXTRACTION ======
+    # Try schema.org structured data
+    ingredients = recipe.get('recipeIngredient') or []
+    if isinstance(ingredients, list):
+        recipe_data['ingredients'] = [ing.strip() for ing in ingredients]
     
+    # ====== INSTRUCTIONS EXTRACTION ======
+    # Try schema.org structured data
+    instructions = recipe.get('recipeInstructions') or []
+    if isinstance(instructions, str):
+        recipe_data['instructions'] = [instructions]
+    elif isinstance(instructions, list):
+        steps = []
+        for step in instructions:
+            if isinstance(step, dict) and step.get('@type') == 'HowToStep':
+                steps.append(step.get('text', ''))
+            elif isinstance(step, str):
+                steps.append(step)
+        recipe_data['instructions'] = steps
+    
+    # A complete JSON-LD recipe needs none of the HTML fallbacks below
+    if recipe_data['name'] and recipe_data['ingredients'] and recipe_data['instructions']:
+        return _clean_recipe(recipe_data)
+    
+    # ====== HTML FALLBACKS ======
     # Fallback to HTML title
     if not recipe_data['name']:
         title_tag = soup.find('h1')
@@ -110,38 +234,10 @@ def extract_recipe_data(url):
             if og_title:
                 recipe_data['name'] = og_title.get('content', '').strip()
     
-    # ====== INGREDIENTS EXTRACTION ======
-    # Try schema.org structured data
-    if script:
-        try:
-            data = json.loads(script.string)
-            if isinstance(data, list):
-                for item in data:
-                    if item.get('@type') == 'Recipe' and item.get('recipeIngredient'):
-                        ingredients = item['recipeIngredient']
-                        if isinstance(ingredients, list):
-                            recipe_data['ingredients'] = [ing.strip() for ing in ingredients]
-                        break
-                else:
-                    if isinstance(data, list) and data:
-                        data = data[0]
-            elif isinstance(data, dict) and data.get('@type') == 'Recipe':
-                ingredients = data.get('recipeIngredient', [])
-                if isinstance(ingredients, list):
-                    recipe_data['ingredients'] = [ing.strip() for ing in ingredients]
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.debug(f"JSON decode error for ingredients: {str(e)}")
-    
     # Fallback to common ingredient selectors
     if not recipe_data['ingredients']:
-        ingredient_selectors = [
-            '.ingredients', '.recipe-ingredients', '.ingredient', 
-            '.ingredients-list', '.recipe-ingred_txt', '.wprm-recipe-ingredient',
-            '.ingredients-section', '[class*="ingredient"]'
-        ]
-        
-        for selector in ingredient_selectors:
-            container = soup.select_one(selector)
+        for selector in INGREDIENT_SELECTORS:
+            container = selector.select_one(soup)
             if container:
                 ingredients = []
                 # Try list items
@@ -161,53 +257,10 @@ def extract_recipe_data(url):
                     recipe_data['ingredients'] = ingredients
                     break
     
-    # ====== INSTRUCTIONS EXTRACTION ======
-    # Try schema.org structured data
-    if script:
-        try:
-            data = json.loads(script.string)
-            if isinstance(data, list):
-                for item in data:
-                    if item.get('@type') == 'Recipe' and item.get('recipeInstructions'):
-                        instructions = item['recipeInstructions']
-                        if isinstance(instructions, list):
-                            steps = []
-                            for step in instructions:
-                                if isinstance(step, dict) and step.get('@type') == 'HowToStep':
-                                    steps.append(step.get('text', ''))
-                                elif isinstance(step, str):
-                                    steps.append(step)
-                            recipe_data['instructions'] = steps
-                        break
-                else:
-                    if isinstance(data, list) and data:
-                        data = data[0]
-            elif isinstance(data, dict) and data.get('@type') == 'Recipe':
-                instructions = data.get('recipeInstructions', [])
-                if isinstance(instructions, list):
-                    steps = []
-                    for step in instructions:
-                        if isinstance(step, dict) and step.get('@type') == 'HowToStep':
-                            steps.append(step.get('text', ''))
-                        elif isinstance(step, str):
-                            steps.append(step)
-                    recipe_data['instructions'] = steps
-                elif isinstance(instructions, str):
-                    recipe_data['instructions'] = [instructions]
-        except (json.JSONDecodeError, TypeError) as e:
-            logger.debug(f"JSON decode error for instructions: {str(e)}")
-    
     # Fallback to common instruction selectors
     if not recipe_data['instructions']:
-        instruction_selectors = [
-            '.instructions', '.recipe-steps', '.directions', 
-            '.recipe-instructions', '.wprm-recipe-instruction', 
-            '.instructions-section', '[class*="instruction"]', 
-            '[class*="direction"]', '[class*="step"]'
-        ]
-        
-        for selector in instruction_selectors:
-            container = soup.select_one(selector)
+        for selector in INSTRUCTION_SELECTORS:
+            container = selector.select_one(soup)
             if container:
                 instructions = []
                 # Try ordered list items
@@ -227,129 +280,161 @@ def extract_recipe_data(url):
                     recipe_data['instructions'] = instructions
                     break
     
-    # Clean up data
-    recipe_data['name'] = recipe_data['name'].replace('\n', ' ').strip() or 'Unknown Recipe Name'
-    recipe_data['ingredients'] = [ing.replace('\n', ' ').strip() for ing in recipe_data['ingredients']]
-    recipe_data['instructions'] = [step.replace('\n', ' ').strip() for step in recipe_data['instructions']]
+    return _clean_recipe(recipe_data)
+
+async def extract_recipe_data(session, url, cache, pool):
+    """Extract recipe details from a URL with robust fallbacks"""
+    cached = cache.get(f"recipe:{url}")
+    if cached and time.time() - cached['stored_at'] < CACHE_MAX_AGE:
+        logger.debug(f"Using cached recipe for: {url}")
+        return cached['recipe']
+    
+    logger.debug(f"Extracting recipe from: {url}")
+    # Only the parsed recipe is cached; storing the page body too would just bloat the shelve
+    content = await make_request(session, url)
+    if not content:
+        logger.warning(f"Failed to retrieve content from {url}")
+        return None
+    
+    # Parsing is CPU-bound, so it runs in a worker process while the event loop keeps fetching
+    recipe_data = await asyncio.get_running_loop().run_in_executor(pool, parse_recipe_page, content, url)
     
     # Validate we have at least some data
     if not recipe_data['ingredients'] and not recipe_data['instructions']:
         logger.warning(f"Incomplete data extracted from {url}")
+    else:
+        cache[f"recipe:{url}"] = {'stored_at': time.time(), 'recipe': recipe_data}
     
     return recipe_data
 
-def get_recipe_links(site_url, max_links=5):
+async def get_recipe_links(session, site_url, cache, max_links=5):
     """Get recipe links from a website's recipe section with multiple strategies"""
     logger.info(f"Getting recipe links from: {site_url}")
-    response = make_request(site_url)
-    if not response or response.status_code != 200:
+    content = await make_request(session, site_url, cache)
+    if not content:
         logger.warning(f"Failed to retrieve {site_url}")
         return []
     
-    soup = BeautifulSoup(response.text, 'html.parser')
-    links = set()
-    domain = urlparse(site_url).netloc
-    
-    # Strategy 1: Find links in recipe cards
-    card_selectors = [
-        '.card', '.recipe-card', '.post-card', '.item', 
-        '.teaser', '.summary', '.content-card', '.result'
-    ]
-    for selector in card_selectors:
-        cards = soup.select(selector)
-        for card in cards:
-            a_tags = card.find_all('a', href=True)
-            for a in a_tags:
-                href = a['href']
-                if href.startswith('/'):
-                    href = f"https://{domain}{href}"
-                if href.startswith('http') and domain in href:
-                    links.add(href)
-                if len(links) >= max_links * 2:
-                    break
+    soup = BeautifulSoup(content, 'lxml')
+    domain = parse_url(site_url).netloc
     
-    # Strategy 2: Find links with recipe in URL
-    if len(links) < max_links:
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            if href.startswith('/'):
-                href = f"https://{domain}{href}"
-            if href.startswith('http') and domain in href:
-                if any(keyword in href.lower() for keyword in ['recipe', 'recipes', 'dish', 'cook', 'make']):
-                    links.add(href)
-            if len(links) >= max_links * 2:
+    # Walk the anchors once, bucketing each link by the strongest signal it matches:
+    # inside a recipe card, recipe-like URL, or recipe-like link text
+    card_links, url_links, text_links = {}, {}, {}
+    for a in soup.find_all('a', href=True):
+        href = a['href']
+        if href.startswith('/'):
+            href = f"https://{domain}{href}"
+        if not (href.startswith('http') and domain in href):
+            continue
+        if a.find_parent(class_=CARD_CLASSES):
+            card_links[href] = None
+            if len(card_links) >= max_links * 2:
                 break
+        elif RECIPE_URL_RE.search(href):
+            url_links[href] = None
+        elif RECIPE_TEXT_RE.search(a.get_text(strip=True)):
+            text_links[href] = None
     
-    # Strategy 3: Find links with recipe in text
-    if len(links) < max_links:
-        for a in soup.find_all('a', href=True):
-            text = a.get_text(strip=True).lower()
-            if 'recipe' in text or 'cook' in text or 'make' in text:
-                href = a['href']
-                if href.startswith('/'):
-                    href = f"https://{domain}{href}"
-                if href.startswith('http') and domain in href:
-                    links.add(href)
-                if len(links) >= max_links * 2:
-                    break
-    
-    # Return up to max_links
-    return list(links)[:max_links]
+    # Card links first, then URL matches, then text matches; return up to max_links
+    links = list(dict.fromkeys([*card_links, *url_links, *text_links]))
+    return links[:max_links]
 
-def scrape_and_save():
-    """Main function to scrape recipes and save to CSV"""
-    all_recipes = []
+async def write_recipes(queue, csvfile, stop):
+    """Single writer task that owns the CSV file; sites only ever put recipes on the queue"""
+    writer = csv.DictWriter(csvfile, fieldnames=['source_url', 'recipe_name', 'ingredients', 'instructions'])
+    writer.writeheader()
+    count = 0
     
-    logger.info("Starting recipe scraping...")
+    while True:
+        recipe = await queue.get()
+        if recipe is None:
+            break
+        if count >= MAX_RECIPES:
+            continue
+        
+        writer.writerow({
+            'source_url': recipe['source_url'],
+            'recipe_name': recipe['name'],
+            'ingredients': '\n'.join(recipe['ingredients']),
+            'instructions': '\n'.join(recipe['instructions'])
+        })
+        logger.debug(f"Saved: {recipe['name'][:50]}...")
+        count += 1
+        # Flush in batches rather than per row. Rows since the last flush sit in the 1 MiB buffer:
+        # an exception still flushes them when the with-block closes the file, a hard kill loses
+        # up to FLUSH_EVERY - 1 of them
+        if count % FLUSH_EVERY == 0:
+            csvfile.flush()
+        
+        # Exit if we have enough recipes
+        if count >= MAX_RECIPES:
+            logger.info(f"Reached {MAX_RECIPES} recipes. Stopping early.")
+            stop.set()
     
-    # Open CSV file early to write headers
-    with open('recipes.csv', 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['source_url', 'recipe_name', 'ingredients', 'instructions']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    return count
+
+async def process_site(session, website, queue, stop, cache, pool):
+    """Scrape one website's recipes and hand them to the writer"""
+    logger.info(f"Processing website: {website}")
+    try:
+        recipe_links = await get_recipe_links(session, website, cache, max_links=5)
+        logger.info(f"Found {len(recipe_links)} recipe links at {website}")
         
-        # Process each website
-        for website in tqdm(RECIPE_WEBSITES, desc="Processing websites"):
-            logger.info(f"Processing website: {website}")
+        for link in recipe_links:
+            if stop.is_set():
+                break
+            # Overlapping sites can link the same page; only the first one fetches it
+            if link in seen_urls:
+                continue
+            seen_urls.add(link)
             try:
-                recipe_links = get_recipe_links(website, max_links=5)
-                logger.info(f"Found {len(recipe_links)} recipe links at {website}")
-                
-                for link in recipe_links:
-                    try:
-                        recipe = extract_recipe_data(link)
-                        if recipe:
-                            # Validate we have at least ingredients or instructions
-                            if recipe['ingredients'] or recipe['instructions']:
-                                # Write to CSV immediately
-                                writer.writerow({
-                                    'source_url': recipe['source_url'],
-                                    'recipe_name': recipe['name'],
-                                    'ingredients': '\n'.join(recipe['ingredients']),
-                                    'instructions': '\n'.join(recipe['instructions'])
-                                })
-                                csvfile.flush()  # Ensure data is written after each recipe
-                                logger.info(f"Saved: {recipe['name'][:50]}...")
-                                all_recipes.append(recipe)
-                            else:
-                                logger.warning(f"Skipping recipe with no data: {link}")
-                        else:
-                            logger.warning(f"Failed to extract recipe from {link}")
-                    except Exception as e:
-                        logger.error(f"Error processing recipe {link}: {str(e)}")
-                    
-                    # Exit if we have enough recipes
-                    if len(all_recipes) >= 100:
-                        logger.info("Reached 100 recipes. Stopping early.")
-                        break
-                
-                if len(all_recipes) >= 100:
-                    break
+                recipe = await extract_recipe_data(session, link, cache, pool)
+                if recipe:
+                    # Validate we have at least ingredients or instructions
+                    if recipe['ingredients'] or recipe['instructions']:
+                        await queue.put(recipe)
+                    else:
+                        logger.warning(f"Skipping recipe with no data: {link}")
+                else:
+                    logger.warning(f"Failed to extract recipe from {link}")
             except Exception as e:
-                logger.error(f"Error processing website {website}: {str(e)}")
+                logger.error(f"Error processing recipe {link}: {str(e)}")
+    except Exception as e:
+        logger.error(f"Error processing website {website}: {str(e)}")
+
+async def scrape_and_save():
+    """Main function to scrape recipes from all sites concurrently and save to CSV"""
+    logger.info("Starting recipe scraping...")
+    # Reset per-run state
+    host_semaphores.clear()
+    host_locks.clear()
+    host_next_ok.clear()
+    seen_urls.clear()
+    
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Open CSV file early to write headers
+    with open('recipes.csv', 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile, \
+            shelve.open(CACHE_PATH) as cache, ProcessPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        prune_cache(cache)
+        queue = asyncio.Queue()
+        stop = asyncio.Event()
+        writer_task = asyncio.create_task(write_recipes(queue, csvfile, stop))
+        
+        # Cap requests in flight across all sites
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=4, ttl_dns_cache=300)
+        # One pooled session: connections to each site are kept alive and reused across its pages
+        async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+            await tqdm_asyncio.gather(
+                *[process_site(session, website, queue, stop, cache, pool) for website in RECIPE_WEBSITES],
+                desc="Processing websites"
+            )
+        
+        await queue.put(None)
+        count = await writer_task
     
-    logger.info(f"Successfully scraped {len(all_recipes)} recipes!")
+    logger.info(f"Successfully scraped {count} recipes!")
     logger.info("Results saved to recipes.csv")
 
 if __name__ == "__main__":
-    scrape_and_save()
\ No newline at end of file
+    asyncio.run(scrape_and_save())
\ No newline at end of file
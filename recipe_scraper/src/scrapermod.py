@@ -1,11 +1,18 @@
-import requests
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
 from bs4 import BeautifulSoup
-import json
+from lxml import etree
+import io
+import orjson
 import csv
-import time
 import os
+import re
+import random
 from urllib.parse import urlparse, urljoin
-from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 import logging
 
 # ========== SETUP ========== #
@@ -39,8 +46,14 @@ RECIPE_WEBSITES = [
 RATE_LIMIT = 2.0  # Increased from 1.5
 MAX_RECIPES_PER_SITE = 10
 MAX_TOTAL_RECIPES = 500
+MAX_WORKERS = os.cpu_count() or 1  # Processes for page parsing
 DATA_DIR = "data"
 TIMEOUT = 15  # Increased timeout
+MAX_RETRIES = 3  # Retries on transient HTTP errors
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_CONCURRENCY = 16  # Requests in flight across all sites
+RECIPE_PATH_RE = re.compile(r'recipe|cook|dish|receipt|food', re.I)
 
 # ========== LOGGING ========== #
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -52,69 +65,90 @@ logging.basicConfig(
         logging.StreamHandler()
     ]
 )
-domain_timers = {}
+# Next time each host may be hit
+host_locks = defaultdict(asyncio.Lock)
+host_next_ok = {}
+# Cap in-flight requests per domain
+host_semaphores = defaultdict(lambda: asyncio.Semaphore(2))
 seen_urls = set()  # Track seen URLs to avoid duplicates
 
 # ========== HELPERS ========== #
+@lru_cache(maxsize=4096)
+def parse_url(url):
+    """urlparse, memoised: link discovery, fetching and dedup all parse the same URLs"""
+    return urlparse(url)
+
+@lru_cache(maxsize=4096)
 def normalize_domain(url):
     """Remove www and protocol variations"""
-    domain = urlparse(url).netloc.lower()
+    domain = parse_url(url).netloc.lower()
     return domain[4:] if domain.startswith('www.') else domain
 
-def make_request(url):
+async def wait_for_slot(domain, backoff=0):
+    """Wait for this host's next slot, and at least `backoff` seconds"""
+    loop = asyncio.get_running_loop()
+    async with host_locks[domain]:
+        wait = max(host_next_ok.get(domain, 0) - loop.time(), backoff)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        host_next_ok[domain] = loop.time() + RATE_LIMIT
+
+async def make_request(session, url):
     domain = normalize_domain(url)
-    now = time.time()
-    
-    # Rate limiting
-    if domain in domain_timers:
-        elapsed = now - domain_timers[domain]
-        if elapsed < RATE_LIMIT:
-            sleep_time = RATE_LIMIT - elapsed
-            time.sleep(sleep_time)
     
-    try:
-        res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        domain_timers[domain] = time.time()
-        res.raise_for_status()
-        
-        # Check content type
-        content_type = res.headers.get('Content-Type', '').lower()
-        if 'text/html' not in content_type:
-            logging.warning(f"Non-HTML content at {url}: {content_type}")
-            return None
-            
-        return res
-    except Exception as e:
-        logging.warning(f"Request failed for {url}: {str(e)}")
-        return None
+    async with host_semaphores[domain]:
+        backoff = 0
+        for attempt in range(MAX_RETRIES + 1):
+            # Rate limiting, retries included
+            await wait_for_slot(domain, backoff)
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=TIMEOUT)) as res:
+                    if res.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                        res.raise_for_status()
+                        
+                        # Check content type
+                        content_type = res.headers.get('Content-Type', '').lower()
+                        if 'text/html' not in content_type:
+                            logging.warning(f"Non-HTML content at {url}: {content_type}")
+                            return None
+                            
+                        return await res.read()
+                # Exponential backoff with jitter
+                backoff = BACKOFF_FACTOR * (2 ** attempt) + random.random()
+            except Exception as e:
+                logging.warning(f"Request failed for {url}: {str(e)}")
+                return None
 
-def get_links(site_url, max_links):
-    res = make_request(site_url)
-    if not res: 
+async def get_links(session, site_url, max_links):
+    content = await make_request(session, site_url)
+    if not content: 
         return []
         
-    soup = BeautifulSoup(res.text, 'html.parser')
+    soup = BeautifulSoup(content, 'lxml')
     links = set()
     base_domain = normalize_domain(site_url)
     
     for a in soup.find_all('a', href=True):
         href = a['href'].strip()
-        if not href or href.startswith(('javascript:', 'mailto:', 'tel:')):
+        if not href or href.startswith(('javascript:', 'mailto:', 'tel:', '#')):
+            continue
+        # Absolute links to other sites are rejected before any URL parsing
+        if '://' in href and base_domain not in href.lower():
             continue
             
         # Build absolute URL
         full_url = urljoin(site_url, href)
-        parsed = urlparse(full_url)
+        parsed = parse_url(full_url)
         
         # Skip non-HTTP links and external domains
         if parsed.scheme not in ('http', 'https'):
             continue
-        if normalize_domain(full_url) != base_domain:
+        netloc = parsed.netloc.lower()
+        if (netloc[4:] if netloc.startswith('www.') else netloc) != base_domain:
             continue
             
         # Check if URL looks like a recipe
-        path = parsed.path.lower()
-        if any(kw in path for kw in ['recipe', 'recipes', 'cook', 'dish', 'receipt', 'food']):
+        if RECIPE_PATH_RE.search(parsed.path):
             if full_url not in seen_urls:
                 links.add(full_url)
                 seen_urls.add(full_url)
@@ -124,12 +158,29 @@ def get_links(site_url, max_links):
             
     return list(links)
 
-def parse_recipe(url):
-    res = make_request(url)
-    if not res: 
-        return None
-        
-    soup = BeautifulSoup(res.text, 'html.parser')
+def _iter_recipes(node, types=('Recipe',)):
+    """Yield every recipe object in parsed JSON-LD, searching lists and @graph wrappers recursively"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _iter_recipes(item, types)
+    elif isinstance(node, dict):
+        node_type = node.get('@type')
+        if node_type in types or (isinstance(node_type, list) and any(t in types for t in node_type)):
+            yield node
+        elif '@graph' in node:
+            yield from _iter_recipes(node['@graph'], types)
+
+def iter_ld_json(content):
+    """Stream the page and yield each JSON-LD script body, then dropping it and its earlier siblings (the rest of the tree is still built)"""
+    for _, elem in etree.iterparse(io.BytesIO(content), events=('end',), tag='script', html=True):
+        if elem.get('type') == 'application/ld+json' and elem.text:
+            yield elem.text
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+def parse_recipe_page(content, url):
+    """Pull the JSON-LD recipe out of a downloaded page; runs in a worker process"""
     recipe = {
         "source_url": url,
         "name": "",
@@ -137,66 +188,64 @@ def parse_recipe(url):
         "instructions": []
     }
     
-    # Try to find JSON-LD recipe data
-    script_tags = soup.find_all('script', type='application/ld+json')
-    for script in script_tags:
+    # Try to find JSON-LD recipe data; the scan stops at the first full recipe
+    for script_text in iter_ld_json(content):
         try:
             # Handle commented JSON
-            data_str = script.string.strip()
+            data_str = script_text.strip()
             if data_str.startswith('<!--'):
                 data_str = data_str[4:-3].strip()  # Remove HTML comments
+            # Breadcrumbs, analytics and article metadata never mention these, so skip decoding them
+            if 'Recipe' not in data_str and 'HowTo' not in data_str:
+                continue
                 
-            data = json.loads(data_str)
+            data = orjson.loads(data_str)
             
-            # Handle different JSON-LD structures
-            if isinstance(data, list):
-                items = data
-            elif '@graph' in data:
-                items = data['@graph']
-            else:
-                items = [data]
+            # A block may hold several recipe nodes; use the first one that is complete
+            for item in _iter_recipes(data, ('Recipe', 'HowTo')):
+                # Get name
+                name = item.get('name') or item.get('headline', '')
+                if name:
+                    recipe['name'] = name
+                
+                # Get ingredients
+                ingredients = item.get('recipeIngredient', [])
+                if ingredients:
+                    recipe['ingredients'] = ingredients
+                
+                # Get instructions
+                instructions = []
+                steps = item.get('recipeInstructions', [])
+                
+                if isinstance(steps, str):
+                    instructions = [steps]
+                elif isinstance(steps, list):
+                    for step in steps:
+                        if isinstance(step, dict):
+                            if step.get('@type') == 'HowToStep':
+                                instructions.append(step.get('text', ''))
+                        elif isinstance(step, str):
+                            instructions.append(step)
+                
+                recipe['instructions'] = instructions
+                
+                # Return if we have valid data
+                if recipe['ingredients'] and recipe['instructions']:
+                    return recipe
                 
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-                    
-                # Check for Recipe type
-                if item.get('@type') in ['Recipe', 'HowTo']:
-                    # Get name
-                    name = item.get('name') or item.get('headline', '')
-                    if name:
-                        recipe['name'] = name
-                    
-                    # Get ingredients
-                    ingredients = item.get('recipeIngredient', [])
-                    if ingredients:
-                        recipe['ingredients'] = ingredients
-                    
-                    # Get instructions
-                    instructions = []
-                    steps = item.get('recipeInstructions', [])
-                    
-                    if isinstance(steps, str):
-                        instructions = [steps]
-                    elif isinstance(steps, list):
-                        for step in steps:
-                            if isinstance(step, dict):
-                                if step.get('@type') == 'HowToStep':
-                                    instructions.append(step.get('text', ''))
-                            elif isinstance(step, str):
-                                instructions.append(step)
-                    
-                    recipe['instructions'] = instructions
-                    
-                    # Return if we have valid data
-                    if recipe['ingredients'] and recipe['instructions']:
-                        return recipe
-                        
         except Exception as e:
             logging.debug(f"JSON-LD parse error at {url}: {str(e)}")
     
     return None  # No valid recipe found
 
+async def parse_recipe(session, url, pool):
+    content = await make_request(session, url)
+    if not content: 
+        return None
+    
+    # Parsing is CPU-bound, so it runs in a worker process while the event loop keeps fetching
+    return await asyncio.get_running_loop().run_in_executor(pool, parse_recipe_page, content, url)
+
 # ========== SAVE FUNCTIONS ========== #
 def save_csv(data, path):
     with open(path, 'w', newline='', encoding='utf-8') as f:
@@ -211,54 +260,95 @@ def save_csv(data, path):
             })
 
 def save_json(data, path):
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
-def save_jsonl(data, path):
-    with open(path, 'w', encoding='utf-8') as f:
-        for item in data:
-            f.write(json.dumps(item, ensure_ascii=False) + '\n')
+def load_jsonl(path):
+    """Yield saved recipes one at a time, skipping a line left half-written by a crash"""
+    with open(path, 'rb') as f:
+        for line in f:
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
 
 # ========== MAIN SCRAPER ========== #
-def main():
-    all_recipes = []
+async def write_recipes(queue, jsonl_f, stop):
+    """Single writer task: streams each recipe to the JSONL file as it arrives and keeps the running count"""
+    count = 0
+    while True:
+        recipe = await queue.get()
+        if recipe is None:
+            break
+        if count >= MAX_TOTAL_RECIPES:
+            continue
+        
+        jsonl_f.write(orjson.dumps(recipe) + b'\n')
+        count += 1
+        
+        # Progress tracking
+        if count % 10 == 0:
+            logging.info(f"Total recipes: {count}/{MAX_TOTAL_RECIPES}")
+        if count >= MAX_TOTAL_RECIPES:
+            stop.set()
     
-    for site in tqdm(RECIPE_WEBSITES, desc="Scraping Sites"):
-        try:
-            logging.info(f"Processing site: {site}")
-            links = get_links(site, MAX_RECIPES_PER_SITE)
+    return count
+
+async def process_site(session, site, queue, stop, pool):
+    try:
+        logging.info(f"Processing site: {site}")
+        links = await get_links(session, site, MAX_RECIPES_PER_SITE)
+        
+        if not links:
+            logging.warning(f"No recipe links found for {site}")
+            return
             
-            if not links:
-                logging.warning(f"No recipe links found for {site}")
-                continue
+        # The outer per-site bar is the only progress display; a bar per site would redraw on every page
+        for link in links:
+            if stop.is_set():
+                break
                 
-            for link in tqdm(links, desc=f"Scraping {urlparse(site).netloc}", leave=False):
-                if len(all_recipes) >= MAX_TOTAL_RECIPES:
-                    break
-                    
-                recipe = parse_recipe(link)
-                if recipe:
-                    all_recipes.append(recipe)
-                    logging.info(f"✓ Collected recipe: {recipe['name'][:50]}...")
-                else:
-                    logging.debug(f"✗ Not a recipe page: {link}")
-                    
-                # Progress tracking
-                if len(all_recipes) % 10 == 0:
-                    logging.info(f"Total recipes: {len(all_recipes)}/{MAX_TOTAL_RECIPES}")
-                    
-        except Exception as e:
-            logging.error(f"Failed on site {site}: {str(e)}")
-            time.sleep(5)  # Pause after failure
-            
-        if len(all_recipes) >= MAX_TOTAL_RECIPES:
-            break
+            recipe = await parse_recipe(session, link, pool)
+            if recipe:
+                await queue.put(recipe)
+                logging.debug(f"✓ Collected recipe: {recipe['name'][:50]}...")
+            else:
+                logging.debug(f"✗ Not a recipe page: {link}")
+                
+    except Exception as e:
+        logging.error(f"Failed on site {site}: {str(e)}")
+        await asyncio.sleep(5)  # Pause after failure
+
+async def main():
+    # Reset per-run state
+    host_semaphores.clear()
+    host_locks.clear()
+    host_next_ok.clear()
+    jsonl_path = os.path.join(DATA_DIR, 'recipes.jsonl')
+    
+    # Recipes go straight to the JSONL file as they arrive rather than piling up in memory
+    with open(jsonl_path, 'wb') as jsonl_f, ProcessPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        queue = asyncio.Queue()
+        stop = asyncio.Event()
+        writer_task = asyncio.create_task(write_recipes(queue, jsonl_f, stop))
+        
+        # Sites are scraped concurrently; per-domain rate limiting still applies within each
+        # Cap requests in flight across all sites
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=4, ttl_dns_cache=300)
+        # One pooled session: connections to each site are kept alive and reused across its pages
+        async with aiohttp.ClientSession(headers=HEADERS, connector=connector) as session:
+            await tqdm_asyncio.gather(
+                *[process_site(session, site, queue, stop, pool) for site in RECIPE_WEBSITES],
+                desc="Scraping Sites"
+            )
+        
+        await queue.put(None)
+        count = await writer_task
 
-    # Save results
-    save_csv(all_recipes, os.path.join(DATA_DIR, 'recipes.csv'))
-    save_json(all_recipes, os.path.join(DATA_DIR, 'recipes.json'))
-    save_jsonl(all_recipes, os.path.join(DATA_DIR, 'recipes.jsonl'))
-    logging.info(f"Successfully saved {len(all_recipes)} recipes")
+    # The JSONL file is canonical; the CSV is streamed from it and the pretty JSON rebuilt from it
+    save_csv(load_jsonl(jsonl_path), os.path.join(DATA_DIR, 'recipes.csv'))
+    save_json(list(load_jsonl(jsonl_path)), os.path.join(DATA_DIR, 'recipes.json'))
+    logging.info(f"Successfully saved {count} recipes")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file